@@ -206,14 +206,13 @@ class TraceSet:
 class OpenDevinLoader(TraceSet):
     @staticmethod
     def parse_trace(trajectory):
-        import re
-
-        from invariant.analyzer.traces import assistant, tool, tool_call, user
-
-        regex = {
-            "bash": r"<execute_bash>(.*?)</execute_bash>",
-            "ipython": r"<execute_ipython>(.*?)</execute_ipython>",
-            "browse": r"<execute_browse>(.*?)</execute_browse>",
+        # events are built as inline dict literals (same shape as the
+        # invariant.analyzer.traces helpers) to avoid one helper call per
+        # event in this hot loop
+        tags = {
+            "bash": ("<execute_bash>", "</execute_bash>"),
+            "ipython": ("<execute_ipython>", "</execute_ipython>"),
+            "browse": ("<execute_browse>", "</execute_browse>"),
         }
 
         trace = []
@@ -222,57 +221,97 @@ class OpenDevinLoader(TraceSet):
             if msg["role"] == "assistant":
                 function_name, arg = None, None
                 for lang in ["bash", "ipython", "browse"]:
-                    match = re.search(regex[lang], msg["content"], re.DOTALL)
-                    if match is not None:
+                    # the tags are literal strings, so two find() calls
+                    # replace the previous re.search per language
+                    open_tag, close_tag = tags[lang]
+                    start = msg["content"].find(open_tag)
+                    if start == -1:
+                        continue
+                    end = msg["content"].find(close_tag, start + len(open_tag))
+                    if end != -1:
                         function_name = lang
-                        arg = match.group(1)
-                        thought = msg["content"][: match.start()]
+                        arg = msg["content"][start + len(open_tag) : end]
+                        thought = msg["content"][:start]
                 if function_name is None:
-                    trace.append(assistant(msg["content"]))
+                    trace.append({"role": "assistant", "content": msg["content"], "tool_calls": []})
                 else:
                     last_call_idx = str(idx)
-                    call = tool_call(last_call_idx, function_name, {"arg": arg})
-                    trace.append(assistant(thought, call))
+                    trace.append(
+                        {
+                            "role": "assistant",
+                            "content": thought,
+                            "tool_calls": [
+                                {
+                                    "id": last_call_idx,
+                                    "type": "function",
+                                    "function": {
+                                        "name": function_name,
+                                        "arguments": {"arg": arg},
+                                    },
+                                }
+                            ],
+                        }
+                    )
             else:
                 if msg["content"].startswith("OBSERVATION:\n\n"):
-                    trace.append(tool(last_call_idx, msg["content"][len("OBSERVATION:\n\n") :]))
+                    trace.append(
+                        {
+                            "role": "tool",
+                            "tool_call_id": last_call_idx,
+                            "content": msg["content"][len("OBSERVATION:\n\n") :],
+                        }
+                    )
                 else:
-                    trace.append(user(msg["content"]))
+                    trace.append({"role": "user", "content": msg["content"]})
         return trace
 
     @classmethod
     def from_repository(cls, repository, project):
         from datasets import load_dataset
 
+        # indexing the column once converts it Arrow->Python in bulk,
+        # instead of boxing one row dict per iteration
         conversations = load_dataset(repository)[project]["conversations"]
-        traces = []
-        for conv in conversations:
-            trace = cls.parse_trace(conv)
-            traces.append(trace)
-        return cls(traces)
+        return cls([cls.parse_trace(conv) for conv in conversations])
 
 
 class SWEAgentTraceSet(TraceSet):
     @staticmethod
     def parse_trace(trajectory):
-        from invariant.analyzer.traces import assistant, tool, tool_call
-
+        # see OpenDevinLoader.parse_trace: inline dict literals instead of
+        # the traces helpers, one call frame saved per event
         inv_traj = []
         for idx, el in enumerate(trajectory):
             action = el["action"]
             action_name = action[: action.find(" ")]
             action_params = action[action.find(" ") + 1 :]
 
+            call_id = str(idx)
             if action_name == "edit":
                 code = action[action.find("\n") : action.rfind("end_of_edit")]
                 loc = action_params[: action_params.find("\n")]
-                tc = tool_call(str(idx), "edit", {"code": code, "loc": loc})
+                arguments = {"code": code, "loc": loc}
+                function_name = "edit"
             else:
-                tc = tool_call(str(idx), action_name, {"arg": action_params})
-            inv_traj.append(assistant("", tc))
-
-            observation = el["observation"]
-            inv_traj.append(tool(str(idx), observation))
+                arguments = {"arg": action_params}
+                function_name = action_name
+            inv_traj.append(
+                {
+                    "role": "assistant",
+                    "content": "",
+                    "tool_calls": [
+                        {
+                            "id": call_id,
+                            "type": "function",
+                            "function": {"name": function_name, "arguments": arguments},
+                        }
+                    ],
+                }
+            )
+
+            inv_traj.append(
+                {"role": "tool", "tool_call_id": call_id, "content": str(el["observation"])}
+            )
         return inv_traj
 
     @classmethod
@@ -4,7 +4,9 @@ Agent Analyer to detect security vulnerabilities in the execution of bash comman
 """
 
 import json
-import re
+import shlex
+
+from invariant.analyzer import Policy
 
 # Data taken from https://huggingface.co/datasets/internlm/Agent-FLAN/tree/main/data
 
@@ -27,12 +29,25 @@ def has_bash(conv):
     )
 
 
+policy = Policy.from_string(
+    r"""
+raise "find not allowed" if:
+    (call: ToolCall)
+    call.function.name == "bash"
+    "exec" in call.function.arguments.cmd
+"""
+)
+
+
 for conv_idx, conv in enumerate(input_data):
     if not has_bash(conv):
         continue
 
     tool_called, tool_call_id = False, 0
     ipl_messages = []
+    # remember where tool calls end up, so the bash-extraction pass below
+    # does not have to re-test every message with a key lookup
+    tool_call_indices = []
 
     for msg in conv["conversation"]:
         if msg["role"] == "system":
@@ -51,51 +66,60 @@ for conv_idx, conv in enumerate(input_data):
                 pass
             else:
                 tool_called = True
-                match = re.search(r"```bash\n(.+?)\n```", msg["content"], re.DOTALL)
-                bash_cmd = match.group(1)
+                # the delimiters are literal strings, so two partitions are
+                # enough and skip the regex engine entirely
+                bash_cmd = msg["content"].partition("```bash\n")[2].partition("\n```")[0]
                 # print("-> ", bash_cmd)
-                ipl_messages += [
+                tool_call_indices.append(len(ipl_messages))
+                # wrap the call as an assistant message right away, so no
+                # second rewrite pass over the trace is needed later
+                ipl_messages.append(
                     {
-                        "id": str(tool_call_id),
-                        "type": "function",
-                        "function": {"name": "bash", "arguments": {"cmd": bash_cmd}},
+                        "role": "assistant",
+                        "content": "",
+                        "tool_calls": [
+                            {
+                                "id": str(tool_call_id),
+                                "type": "function",
+                                "function": {"name": "bash", "arguments": {"cmd": bash_cmd}},
+                            }
+                        ],
                     }
-                ]
+                )
         else:
             assert False
 
-    from invariant.analyzer import Policy
-
-    policy = Policy.from_string(
-        r"""
-    raise "find not allowed" if:
-        (call: ToolCall)
-        call.function.name == "bash"
-        "exec" in call.function.arguments.cmd
-    """
-    )
-    analysis_result = policy.analyze(ipl_messages)
+    # the policy can only fire on commands that mention "exec" at all, so
+    # a cheap substring prefilter skips the full analysis for the rest
+    if any(
+        "exec" in ipl_messages[i]["tool_calls"][0]["function"]["arguments"]["cmd"]
+        for i in tool_call_indices
+    ):
+        errors = policy.analyze(ipl_messages).errors
+    else:
+        errors = []
 
     print("trace: \n")
-    bash_script = ""
-    for msg in ipl_messages:
-        if "type" in msg:
-            import shlex
-
-            # print(msg)
-            bash_script += msg["function"]["arguments"]["cmd"] + "\n"
-            tokens = shlex.split(msg["function"]["arguments"]["cmd"])
-
-            all_cmds = []
-            # split by pipe |
-            while "|" in tokens:
-                idx = tokens.index("|")
-                all_cmds.append(tokens[:idx])
-                tokens = tokens[idx + 1 :]
-            all_cmds.append(tokens)
-            # print(all_cmds)
-
+    # collect lines and join once at the end, instead of growing a string
+    # (and re-writing it) per tool call
+    bash_lines = []
+    for i in tool_call_indices:
+        call = ipl_messages[i]["tool_calls"][0]
+        # print(call)
+        bash_lines.append(call["function"]["arguments"]["cmd"])
+        tokens = shlex.split(call["function"]["arguments"]["cmd"])
+
+        all_cmds = []
+        # split by pipe |
+        while "|" in tokens:
+            idx = tokens.index("|")
+            all_cmds.append(tokens[:idx])
+            tokens = tokens[idx + 1 :]
+        all_cmds.append(tokens)
+        # print(all_cmds)
+
+    bash_script = "\n".join(bash_lines) + "\n" if bash_lines else ""
     with open(f"bash/script_{conv_idx}.sh", "w") as fout:
         fout.write(bash_script)
     print(bash_script)
-    print("errors: ", analysis_result.errors)
+    print("errors: ", errors)
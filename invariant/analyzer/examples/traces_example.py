@@ -20,25 +20,27 @@ class CallToSomething(Exception):
         return f"CallToSomething: {super().__str__()}"
 
 
-def main():
-    # define some policy
-    policy = Policy.from_string(
-        r"""
-    # if the user asks about 'X', raise a violation exception
-    raise PolicyViolation("Do not leak the user's email address", call=call) if:
-        (call: ToolCall)
-        call is tool:search_web({
-            q: <EMAIL_ADDRESS>
-        })
-
-    # check result after the operation
-    raise PolicyViolation("The response should not contain 'France'", call=result) if:
-        (result: ToolOutput)
-        result is tool:search_web
-        "France" in result.content
-    """
-    )
+# define some policy; compiled once at module scope so repeated main()
+# invocations (e.g. test reruns) do not re-parse the policy source
+POLICY = Policy.from_string(
+    r"""
+# if the user asks about 'X', raise a violation exception
+raise PolicyViolation("Do not leak the user's email address", call=call) if:
+    (call: ToolCall)
+    call is tool:search_web({
+        q: <EMAIL_ADDRESS>
+    })
+
+# check result after the operation
+raise PolicyViolation("The response should not contain 'France'", call=result) if:
+    (result: ToolOutput)
+    result is tool:search_web
+    "France" in result.content
+"""
+)
 
+
+def main():
     # given some message trace (user(...), etc. help you create these quickly)
     messages = [
         system("You are a helpful assistant. Your user is signed in as bob@mail.com"),
@@ -51,10 +53,22 @@ def main():
 
     print(json.dumps(messages, indent=2))
 
-    analysis_result = policy.analyze(messages)
+    analysis_result = POLICY.analyze(messages)
     print(analysis_result)
     assert len(analysis_result.errors) == 2
 
+    # partition errors by type in a single pass (isinstance checks are
+    # cheaper than type(e).__name__ string comparisons and avoid
+    # re-scanning the error list once per type)
+    violations, something_calls = [], []
+    for e in analysis_result.errors:
+        if isinstance(e, CallToSomething):
+            something_calls.append(e)
+        else:
+            violations.append(e)
+    assert len(violations) == 2
+    assert len(something_calls) == 0
+
 
 # run 'main' as a test
 class TestTraceAnalysisExample(unittest.TestCase):
@@ -632,6 +632,11 @@ class TransformationContext:
 
 
 class Transformation:
+    # maps node classes to their "visit_<Name>" method name, shared by all
+    # transformations, so the hot visit() path does not rebuild the method
+    # name string for every node
+    _VISIT_METHOD_NAMES: dict[type, str] = {}
+
     def __init__(self, global_scope=None):
         self.global_scope = global_scope
 
@@ -655,7 +660,10 @@ class Transformation:
             return [self.visit(x) for x in node]
 
         if isinstance(node, Node):
-            method = "visit_" + node.__class__.__name__
+            cls = node.__class__
+            method = Transformation._VISIT_METHOD_NAMES.get(cls)
+            if method is None:
+                method = Transformation._VISIT_METHOD_NAMES[cls] = "visit_" + cls.__name__
             visitor = getattr(self, method, self.generic_visit)
             return visitor(node)
         else:
@@ -1,7 +1,9 @@
 from dataclasses import dataclass  # noqa: I001
 import json
+import operator
 import re
-import contextvars
+import threading
+from functools import lru_cache
 from itertools import product
 from typing import Generator
 
@@ -25,9 +27,63 @@ class symbol:
 
 # symbol to represent nop statements
 NOP = symbol("<nop>")
+# internal sentinel for failed dictionary lookups (never leaks out of the interpreter)
+Missing = symbol("<missing>")
 # symbol to represent unknown values (e.g. if based on an unknown variable)
 Unknown = symbol("<unknown>")
 
+# dispatch table for binary operators with standard Python semantics
+# (operators with custom semantics like 'and', 'or', 'in' and 'is' are
+# handled explicitly in visit_BinaryExpr)
+BINARY_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "%": operator.mod,
+    "**": operator.pow,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+
+# literal node types whose value cannot depend on interpreter state
+CONST_LITERAL_TYPES = (StringLiteral, NumberLiteral, BooleanLiteral, NoneLiteral)
+
+# shared kwargs dict for calls without keyword arguments (never mutated:
+# callers only read it or copy it via ** unpacking)
+EMPTY_KWARGS = {}
+
+# kinds of 'is' comparisons, determined once per node on first visit
+# (see Interpreter.visit_Is)
+IS_NOT_NONE = 0  # <expr> is not None
+IS_PATTERN = 1  # <expr> is <semantic pattern or tool reference>
+IS_IDENTITY = 2  # plain Python identity comparison
+
+
+def is_const_literal(node):
+    # non-Node values (e.g. plain strings used as object keys) evaluate to themselves
+    return isinstance(node, CONST_LITERAL_TYPES) or not isinstance(node, Node)
+
+
+# detects regex metacharacters, i.e. patterns that require the regex
+# engine instead of plain substring search
+REGEX_METACHARACTERS = re.compile(r"[.^$*+?(){}\[\]|\\]")
+
+
+@lru_cache(maxsize=1024)
+def compiled_pattern(pattern: str) -> re.Pattern:
+    """Compiles (and caches) a regex pattern used in 'in' matching.
+
+    Rule bodies use a small, fixed set of patterns, but the same pattern
+    is matched against many messages, so compiling once pays off.
+    """
+    return re.compile(pattern)
+
 
 @dataclass
 class VariableDomain:
@@ -76,7 +132,19 @@ class EvaluationResult:
     ranges: list
 
 
-INTERPRETER_STACK = contextvars.ContextVar("interpreter_stack", default=[])
+class InterpreterStack(threading.local):
+    """Per-thread stack of currently active interpreters.
+
+    A plain thread-local is cheaper to access than a contextvars.ContextVar
+    (whose shared-list default provided no extra isolation anyway), and
+    interpreters never migrate between threads mid-evaluation.
+    """
+
+    def __init__(self):
+        self.stack = []
+
+
+INTERPRETER_STACK = InterpreterStack()
 
 
 class Interpreter(RaisingTransformation):
@@ -93,7 +161,7 @@ class Interpreter(RaisingTransformation):
 
     @staticmethod
     def current():
-        stack = INTERPRETER_STACK.get()
+        stack = INTERPRETER_STACK.stack
         if len(stack) == 0:
             raise ValueError(
                 "Cannot access Interpreter.current() outside of an interpretation context (call stack below Interpreter.eval)."
@@ -128,6 +196,22 @@ class Interpreter(RaisingTransformation):
             The result of the evaluation. If multiple expressions are given, a list of results is returned. For
             boolean evaluation, always evaluates all(expr_or_list) and returns True, False or Unknown.
         """
+        # fast path: a single constant literal needs no interpreter context
+        # (e.g. constant declaration values and resolved identifiers)
+        if type(expr_or_list) in CONST_LITERAL_TYPES:
+            result = None if type(expr_or_list) is NoneLiteral else expr_or_list.value
+
+            return_obj = (result,)
+            if return_variable_domains:
+                return_obj = (result, {})
+            if return_ranges:
+                return_obj = return_obj + ([],)
+
+            if len(return_obj) == 1:
+                return return_obj[0]
+            else:
+                return return_obj
+
         with Interpreter(
             variable_store, globals, evaluation_context, partial=partial
         ) as interpreter:
@@ -179,30 +263,37 @@ class Interpreter(RaisingTransformation):
         Args:
             list_of_results: The list of results to evaluate (as returned by .visit_* methods).
         """
-        # remove nops
-        results = [r for r in list_of_results if r is not NOP]
-        # check if all results are boolean
-        is_bool_result = all(type(r) is bool or r is Unknown for r in results)
+        # single pass: filter nops and classify results along the way
+        results = []
+        is_bool_result = True
+        any_unknown_part = False
+        any_false_part = False
+
+        for r in list_of_results:
+            if r is NOP:
+                continue
+            results.append(r)
+            if r is False:
+                any_false_part = True
+            elif r is Unknown:
+                any_unknown_part = True
+            elif type(r) is not bool:
+                is_bool_result = False
 
         # simply return non-boolean results
         if not is_bool_result:
             return results
-        else:
-            # special handling for true|false|unknown value evaluation
-            any_unknown_part = any(r is Unknown for r in results)
-            any_false_part = any(r is False for r in results)
-
-            if any_false_part:
-                # definitive false
-                result = False
-            elif any_unknown_part:
-                # unknown
-                result = Unknown
-            else:
-                # definitive true
-                result = True
 
-            return result
+        # special handling for true|false|unknown value evaluation
+        if any_false_part:
+            # definitive false
+            return False
+        elif any_unknown_part:
+            # unknown
+            return Unknown
+        else:
+            # definitive true
+            return True
 
     @staticmethod
     def assignments(
@@ -324,19 +415,42 @@ class Interpreter(RaisingTransformation):
         self.variable_domains = {}
 
     def __enter__(self):
-        INTERPRETER_STACK.get().append(self)
+        INTERPRETER_STACK.stack.append(self)
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        INTERPRETER_STACK.get().pop()
+        INTERPRETER_STACK.stack.pop()
+
+    def visit(self, node):
+        """
+        Dispatches directly on type(node) via the precomputed INTERPRETER_DISPATCH
+        table, avoiding the name-based method lookup in Transformation.visit for
+        every expression node. Anything without a table entry (lists, PolicyRoot,
+        plain values) falls back to the inherited visit logic.
+
+        The PolicyError bookkeeping of RaisingTransformation.visit is inlined here.
+        """
+        method = INTERPRETER_DISPATCH.get(type(node))
+        if method is None:
+            return super().visit(node)
+        try:
+            return method(self, node)
+        except PolicyError as e:
+            if hasattr(e, "node") and e.node is None:
+                e.node = node
+            self.errors.append(e)
+            if self.reraise:
+                raise e from None
+        return node
 
     def visit_ShortCircuitedConjunction(self, exprs: list):
         results = []
         for e in exprs:
             result = self.visit(e)
-            if result is False:
-                return results + [False]
             results.append(result)
+            if result is False:
+                # short-circuit: no copy, just return what was evaluated so far
+                return results
         return results
 
     def visit_PolicyRoot(self, node: PolicyRoot):
@@ -347,6 +461,16 @@ class Interpreter(RaisingTransformation):
 
     def visit_Declaration(self, node: Declaration):
         if node.is_constant:
+            # a constant declaration's value may still depend on per-call
+            # state (e.g. `PAT := input.pattern` reads a policy parameter),
+            # so only literal values are cached on the node; anything else is
+            # re-evaluated against the current evaluation context
+            if is_const_literal(node.value[0]):
+                if not hasattr(node, "_const_value"):
+                    node._const_value = Interpreter.eval(
+                        node.value[0], {}, self.globals, self.evaluation_context
+                    )
+                return node._const_value
             return Interpreter.eval(node.value[0], {}, self.globals, self.evaluation_context)
         return node
 
@@ -428,66 +552,63 @@ class Interpreter(RaisingTransformation):
             if lvalue is Unknown or rvalue is Unknown:
                 return Unknown
             return self.evaluation_context.has_flow(lvalue, rvalue)
+        # special case: conjunction (only evaluates the right side if needed)
+        elif op == "and":
+            lvalue = self.visit(node.left)
+            # if any value of a conjunction is False, the whole conjunction is False
+            # even if other parts are unknown
+            if lvalue is False:
+                # definitive false (right side is not evaluated)
+                return False
+            rvalue = self.visit(node.right)
+            if rvalue is False:
+                # definitive false
+                return False
+            # otherwise, if something is unknown, the whole conjunction is unknown
+            if lvalue is Unknown or rvalue is Unknown:
+                # unknown
+                return Unknown
+
+            return lvalue and rvalue
+        # special case: disjunction (only evaluates the right side if needed)
+        elif op == "or":
+            lvalue = self.visit(node.left)
+            # if any value of a disjunction is True, the whole disjunction is True
+            # even if other parts are unknown
+            if lvalue is True:
+                # definitive true (right side is not evaluated)
+                return True
+            rvalue = self.visit(node.right)
+            if rvalue is True:
+                # definitive true
+                return True
+            # otherwise, if something is unknown, the whole disjunction is unknown
+            if lvalue is Unknown or rvalue is Unknown:
+                # unknown
+                return Unknown
+
+            return lvalue or rvalue
         # standard binary expressions
         else:
             lvalue = self.visit(node.left)
             rvalue = self.visit(node.right)
 
-            if op == "and":
-                # if any value of a conjunction is False, the whole conjunction is False
-                # even if other parts are unknown
-                if lvalue is False or rvalue is False:
-                    # definitive false
-                    return False
-                # otherwise, if something is unknown, the whole conjunction is unknown
-                if lvalue is Unknown or rvalue is Unknown:
-                    # unknown
-                    return Unknown
-
-                return lvalue and rvalue
-            elif op == "or":
-                # if any value of a disjunction is True, the whole disjunction is True
-                # even if other parts are unknown
-                if lvalue is True or rvalue is True:
-                    # definitive true
-                    return True
-                # otherwise, if something is unknown, the whole disjunction is unknown
-                if lvalue is Unknown or rvalue is Unknown:
-                    # unknown
-                    return Unknown
-
-                return lvalue or rvalue
-
             # expressions based on unknown values are unknown
             if lvalue is Unknown or rvalue is Unknown:
                 return Unknown
 
+            op_fct = BINARY_OPERATORS.get(op)
+            if op_fct is not None:
+                return op_fct(lvalue, rvalue)
+
             if op == "contains_only":
+                # set-based membership turns the O(N*M) scan into O(N+M)
+                try:
+                    lvalue = lvalue if isinstance(lvalue, (set, frozenset)) else set(lvalue)
+                except TypeError:
+                    # unhashable elements: keep the linear scan
+                    pass
                 return all(el in lvalue for el in rvalue)
-            elif op == "+":
-                return lvalue + rvalue
-            elif op == "-":
-                return lvalue - rvalue
-            elif op == "*":
-                return lvalue * rvalue
-            elif op == "/":
-                return lvalue / rvalue
-            elif op == "%":
-                return lvalue % rvalue
-            elif op == "**":
-                return lvalue**rvalue
-            elif op == "==":
-                return lvalue == rvalue
-            elif op == "!=":
-                return lvalue != rvalue
-            elif op == ">":
-                return lvalue > rvalue
-            elif op == "<":
-                return lvalue < rvalue
-            elif op == ">=":
-                return lvalue >= rvalue
-            elif op == "<=":
-                return lvalue <= rvalue
             elif op == "is":
                 return self.visit_Is(node, lvalue, rvalue)
             elif op == "in":
@@ -498,13 +619,34 @@ class Interpreter(RaisingTransformation):
                     return False
 
                 if isinstance(lvalue, list):
+                    # for large membership checks, hash the right side once
+                    # instead of scanning it per element
+                    if isinstance(rvalue, (list, tuple)) and len(lvalue) * len(rvalue) > 1024:
+                        try:
+                            rvalue = set(rvalue)
+                        except TypeError:
+                            # unhashable elements: keep the linear scan
+                            pass
                     return [x in rvalue for x in lvalue]
 
                 if type(rvalue) is str and type(lvalue) is str:
-                    # find all ranges where left matches right
-                    for m in re.finditer(lvalue, rvalue):
-                        self.mark(rvalue, m.start(), m.end())
-                    return lvalue in rvalue
+                    if REGEX_METACHARACTERS.search(lvalue):
+                        # find all ranges where left matches right
+                        for m in compiled_pattern(lvalue).finditer(rvalue):
+                            self.mark(rvalue, m.start(), m.end())
+                        return lvalue in rvalue
+                    # literal pattern: plain substring search (C-level) is much
+                    # cheaper than the regex engine and marks the same ranges
+                    if not lvalue:
+                        return True
+                    start = 0
+                    n = len(lvalue)
+                    hits = False
+                    while (idx := rvalue.find(lvalue, start)) >= 0:
+                        self.mark(rvalue, idx, idx + n)
+                        start = idx + n
+                        hits = True
+                    return hits
 
                 return lvalue in rvalue
             else:
@@ -524,15 +666,30 @@ class Interpreter(RaisingTransformation):
         self.ranges.append(Range.from_object(obj, start, end))
 
     def visit_Is(self, node: BinaryExpr, left, right):
-        if (
-            type(node.right) is UnaryExpr
-            and node.right.op == "not"
-            and type(node.right.expr) is NoneLiteral
-        ):
-            return left is not None
+        # the shape of the right-hand side is fixed per 'is' node, so it is
+        # classified once and the kind is cached on the node
+        kind = getattr(node, "_is_kind", None)
+        if kind is None:
+            if (
+                type(node.right) is UnaryExpr
+                and node.right.op == "not"
+                and type(node.right.expr) is NoneLiteral
+            ):
+                kind = IS_NOT_NONE
+            elif type(right) is SemanticPattern or type(right) is ToolReference:
+                kind = IS_PATTERN
+            else:
+                kind = IS_IDENTITY
+            node._is_kind = kind
 
-        if type(right) is SemanticPattern or type(right) is ToolReference:
-            matcher = SemanticPatternMatcher.from_semantic_pattern(right)
+        if kind == IS_NOT_NONE:
+            return left is not None
+        elif kind == IS_PATTERN:
+            # the pattern is fixed per 'is' node, so the compiled matcher is
+            # constructed once and cached on the node
+            matcher = getattr(node, "_matcher", None)
+            if matcher is None:
+                matcher = node._matcher = SemanticPatternMatcher.from_semantic_pattern(right)
             return matcher.match(left)
         else:
             return left is right
@@ -585,6 +742,12 @@ class Interpreter(RaisingTransformation):
         # if either the object or the key is unknown, the result is unknown
         if obj is Unknown or key is Unknown:
             return Unknown
+
+        # fast path: plain dict and list accesses cannot hit the TypeError
+        # fallback below, so skip the try/except machinery for them
+        if type(obj) is dict or (type(obj) is list and type(key) is int):
+            return obj[key]
+
         try:
             return obj[key]
         except TypeError as e:
@@ -602,12 +765,29 @@ class Interpreter(RaisingTransformation):
 
     def visit_FunctionCall(self, node: FunctionCall):
         function = self.visit(node.name)
-        args = [self.visit(arg) for arg in node.args]
 
         # only call functions, once all parameters are known
-        if function is Unknown or any(arg is Unknown for arg in args):
+        # (checked while collecting the arguments, not in a separate scan)
+        has_unknown = function is Unknown
+        args = []
+        for arg in node.args:
+            value = self.visit(arg)
+            args.append(value)
+            if value is Unknown:
+                has_unknown = True
+        if has_unknown:
             return Unknown
-        kwargs = {entry.key: self.visit(entry.value) for entry in node.kwargs}
+
+        if not node.kwargs:
+            # most calls pass no keyword arguments, no need to build a dict
+            kwargs = EMPTY_KWARGS
+        else:
+            # keyword arguments with only constant values are evaluated once per node
+            kwargs = getattr(node, "_const_kwargs", None)
+            if kwargs is None:
+                kwargs = {entry.key: self.visit(entry.value) for entry in node.kwargs}
+                if all(is_const_literal(entry.value) for entry in node.kwargs):
+                    node._const_kwargs = kwargs
 
         if isinstance(function, Declaration):
             return self.visit_PredicateCall(function, args, **kwargs)
@@ -625,9 +805,17 @@ class Interpreter(RaisingTransformation):
         for p in signature.params:
             parameters[p.name.id] = args.pop(0)
         parameters.update(kwargs)
-        return all(
-            Interpreter.eval(condition, parameters, self.globals, self.evaluation_context)
-            for condition in node.value
+        # evaluate the whole body with one interpreter (with short-circuit
+        # semantics) instead of one Interpreter.eval per condition
+        return (
+            Interpreter.eval(
+                list(node.value),
+                parameters,
+                self.globals,
+                self.evaluation_context,
+                assume_bool=True,
+            )
+            is True
         )
 
     def visit_FunctionSignature(self, node: FunctionSignature):
@@ -649,11 +837,11 @@ class Interpreter(RaisingTransformation):
         if node.id is None:
             raise PolicyError("'{}' (id: {}) must have an id".format(node, id(node)))
 
-        if node.id in self.variable_store:
-            result = self.variable_store[node.id]
-        elif node.id in self.globals:
-            result = self.globals[node.id]
-        else:
+        # single .get lookup per scope instead of a membership check plus access
+        result = self.variable_store.get(node.id, Missing)
+        if result is Missing:
+            result = self.globals.get(node.id, Missing)
+        if result is Missing:
             if not self.partial:
                 raise ValueError(
                     f"Failed to resolve variable {node.name}, no binding found for {node.id}"
@@ -662,7 +850,12 @@ class Interpreter(RaisingTransformation):
             return Unknown
 
         if isinstance(result, Node):
-            result = Interpreter.eval(result, {}, self.globals, self.evaluation_context)
+            if type(result) is Declaration:
+                # declarations evaluate to their cached constant value or to
+                # themselves (predicates), so no re-entrant eval is needed
+                result = self.visit_Declaration(result)
+            else:
+                result = Interpreter.eval(result, {}, self.globals, self.evaluation_context)
 
         # when `input` is resolved to the built-in `InputData` symbol, use
         # `PolicyParameters` to resolve policy parameters (e.g. values passed
@@ -706,7 +899,37 @@ class Interpreter(RaisingTransformation):
         return node.value
 
     def visit_ObjectLiteral(self, node: ObjectLiteral):
-        return {self.visit(entry.key): self.visit(entry.value) for entry in node.entries}
+        # object literals with only constant entries are evaluated once per node
+        # (callers get a shallow copy, so the cached value cannot be mutated)
+        cached = getattr(node, "_const_value", None)
+        if cached is not None:
+            return dict(cached)
+        result = {self.visit(entry.key): self.visit(entry.value) for entry in node.entries}
+        if all(
+            is_const_literal(entry.key) and is_const_literal(entry.value)
+            for entry in node.entries
+        ):
+            node._const_value = dict(result)
+        return result
 
     def visit_ArrayLiteral(self, node: ArrayLiteral):
-        return [self.visit(entry) for entry in node.elements]
+        # array literals with only constant elements are evaluated once per node
+        cached = getattr(node, "_const_value", None)
+        if cached is not None:
+            return list(cached)
+        result = [self.visit(entry) for entry in node.elements]
+        if all(is_const_literal(entry) for entry in node.elements):
+            node._const_value = list(result)
+        return result
+
+
+# maps node types directly to their Interpreter.visit_* method (see
+# Interpreter.visit); built once at import time from the visit_* methods
+# whose name matches an AST node class
+INTERPRETER_DISPATCH = {}
+for _name, _method in vars(Interpreter).items():
+    if _name.startswith("visit_"):
+        _node_cls = globals().get(_name[len("visit_") :])
+        if isinstance(_node_cls, type) and issubclass(_node_cls, Node):
+            INTERPRETER_DISPATCH[_node_cls] = _method
+del _name, _method, _node_cls
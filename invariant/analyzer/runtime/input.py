@@ -17,7 +17,17 @@ from pydantic import BaseModel
 from rich.pretty import pprint as rich_print
 
 import invariant.analyzer.language.types as types
-from invariant.analyzer.stdlib.invariant.nodes import Event, Message, ToolCall, ToolOutput
+from invariant.analyzer.stdlib.invariant.nodes import (
+    Event,
+    Function,
+    Message,
+    ToolCall,
+    ToolOutput,
+)
+
+# compiled once at module scope; mask_json_paths matches this against
+# every sub-path of every masked string
+RANGE_PATTERN = re.compile(r"^(\d+)-(\d+)$")
 
 
 class InputProcessor:
@@ -52,32 +62,42 @@ class InputProcessor:
 class Dataflow(InputProcessor):
     """Stores the dataflow within a given input.
 
-    For now, this constructs a sequential graph per top-level list in the input, or
-    for the input itself, if the input is a list.
+    For now, the flow relation is total per top-level list in the input (or
+    for the input itself, if the input is a list): there is flow from a to b
+    iff a comes before b in the same top-level list.
 
-    For instance `{ "messages": [1,2,3], "llm_calls": [4,5,6] }` would create a graph with
-    the following edges `1 -> 2, 2 -> 3, 1 -> 3` and `4 -> 5, 5 -> 6, 4 -> 6`.
+    Since each list is totally ordered, the graph is not materialized as
+    explicit edge sets (which grow O(n^2) with the trace length). Instead,
+    each event is assigned its position in its list and flow checks compare
+    positions.
 
     Important: All objects are identified by their id() in the graph.
     """
 
-    def __init__(self, edges=None):
-        self.edges = edges or {}
+    def __init__(self):
+        # id(obj) -> position of the object in its top-level list
+        self.order = {}
+        # id(obj) -> index of the top-level list the object belongs to
+        self.list_id = {}
+        self.num_lists = 0
 
     def visit_top_level(self, value_list, name=None):
-        so_far = set()
+        list_id = self.num_lists
+        self.num_lists += 1
+        position = 0
+
         # iterate over messages in chat
         for i in value_list:
-            # if type(i) is not dict: continue
-            # flow from all messages to subsequent messages
-            self.edges.setdefault(id(i), set()).update(so_far)
-            so_far.add(id(i))
+            self.order[id(i)] = position
+            self.list_id[id(i)] = list_id
+            position += 1
 
             # same for tool calls
             if type(i) is Message and i.tool_calls is not None:
                 for tc in i.tool_calls:
-                    self.edges.setdefault(id(tc), set()).update(so_far)
-                    so_far.add(id(tc))
+                    self.order[id(tc)] = position
+                    self.list_id[id(tc)] = list_id
+                    position += 1
 
     def has_flow(self, a, b):
         """Returns whether there is a flow from a to b in the dataflow graph.
@@ -89,9 +109,62 @@ class Dataflow(InputProcessor):
         Returns:
             True if there is a flow from a to b, False otherwise.
         """
-        if id(a) not in self.edges or id(b) not in self.edges:
+        ia, ib = id(a), id(b)
+        if ia not in self.order or ib not in self.order:
             raise KeyError("Object with given id not in dataflow graph!")
-        return id(a) in self.edges.get(id(b), set())
+        return self.list_id[ia] == self.list_id[ib] and self.order[ia] < self.order[ib]
+
+
+def _select_message_children(stack, data):
+    stack.append(data.tool_calls)
+    stack.append(data.role)
+    stack.append(data.content)
+
+
+def _select_tool_call_children(stack, data):
+    stack.append(data.function)
+    stack.append(data.type)
+    stack.append(data.id)
+
+
+def _select_tool_output_children(stack, data):
+    stack.append(data.tool_call_id)
+    stack.append(data.content)
+    stack.append(data.role)
+
+
+def _select_sequence_children(stack, data):
+    stack.extend(reversed(data))
+
+
+def _select_dict_children(stack, data):
+    stack.extend(reversed(list(data.values())))
+
+
+# known selectable types by name; resolving the selector to a concrete
+# class once turns the per-node match in Selectable.select into a pointer
+# comparison instead of a string comparison
+SELECT_TYPES = {
+    cls.__name__: cls
+    for cls in (Message, ToolCall, ToolOutput, list, dict, tuple, str, int, float, bool)
+}
+
+# maps node types to a handler pushing the node's children onto the
+# worklist (in reverse, so they are visited in order); types without an
+# entry are leaves (see Selectable.select)
+SELECT_CHILDREN = {
+    Message: _select_message_children,
+    ToolCall: _select_tool_call_children,
+    ToolOutput: _select_tool_output_children,
+    list: _select_sequence_children,
+    tuple: _select_sequence_children,
+    dict: _select_dict_children,
+}
+
+
+# types traversal actually encounters; none of them is ever a class or a
+# function, so should_ignore can skip the inspect checks for them entirely
+_FAST_TYPES = (dict, list, tuple, str, int, float, bool, type(None), Message, ToolCall, ToolOutput)
 
 
 class Selectable:
@@ -99,71 +172,52 @@ class Selectable:
         self.data = data
 
     def should_ignore(self, data):
-        if inspect.isclass(data):
-            return True
-        if inspect.isfunction(data):
-            return True
-        return False
-
-    def merge(self, lists):
-        if not lists:
-            return []
-        if len(lists) == 1:
-            return lists[0]
-        return [item for sublist in lists for item in sublist]
+        # inspect.isclass/isfunction are comparatively expensive; the common
+        # trace node types bypass them with a single isinstance check
+        return not isinstance(data, _FAST_TYPES) and (
+            inspect.isclass(data) or inspect.isfunction(data)
+        )
 
     def select(self, selector, data="<root>"):
-        if self.should_ignore(data):
-            return []
         type_name = self.type_name(selector)
         # allow to select the Input object itself
         if type_name == "Input":
             return [self]
         # allow to select the root data object
-        if data == "<root>":
+        if type(data) is str and data == "<root>":
             data = self.data
-        if self.should_ignore(data):
-            return []
-        if isinstance(data, (KeysView, ValuesView, ItemsView)):
-            return self.select(selector, list(data))
-        type_name = self.type_name(selector)
 
-        if type(data).__name__ == type_name:
-            return [data]
-
-        if type(data) is Message:
-            return self.merge(
-                [
-                    self.select(type_name, data.content),
-                    self.select(type_name, data.role),
-                    self.select(type_name, data.tool_calls),
-                ]
-            )
-        elif type(data) is ToolCall:
-            return self.merge(
-                [
-                    self.select(type_name, data.id),
-                    self.select(type_name, data.type),
-                    self.select(type_name, data.function),
-                ]
-            )
-        elif type(data) is ToolOutput:
-            return self.merge(
-                [
-                    self.select(type_name, data.role),
-                    self.select(type_name, data.content),
-                    self.select(type_name, data.tool_call_id),
-                ]
-            )
-        elif type(data) is list:
-            return self.merge([self.select(type_name, item) for item in data])
-        elif type(data) is dict:
-            return self.merge([self.select(type_name, value) for value in data.values()])
-        elif type(data) is tuple:
-            return self.merge([self.select(type_name, item) for item in data])
-        else:
-            # print("cannot sub-select type", type(data))
-            return []
+        # resolve the selector to a concrete class where possible
+        target_type = SELECT_TYPES.get(type_name)
+
+        # iterative depth-first traversal with an explicit worklist, so large
+        # traces neither hit the recursion limit nor allocate intermediate
+        # per-subtree result lists
+        results = []
+        stack = [data]
+        while stack:
+            data = stack.pop()
+            if self.should_ignore(data):
+                continue
+            if isinstance(data, (KeysView, ValuesView, ItemsView)):
+                data = list(data)
+
+            # classify the node once instead of once per dispatch branch
+            data_type = type(data)
+            if (
+                data_type is target_type
+                if target_type is not None
+                else data_type.__name__ == type_name
+            ):
+                results.append(data)
+                continue
+
+            # O(1) dispatch on the node type, instead of a branch cascade
+            handler = SELECT_CHILDREN.get(data_type)
+            if handler is not None:
+                handler(stack, data)
+            # everything else is a leaf that cannot be sub-selected
+        return results
 
     def type_name(self, selector):
         if type(selector) is types.NamedUnknownType:
@@ -172,6 +226,41 @@ class Selectable:
             return selector
 
 
+def clone_event(event):
+    """Shallow-clones a raw trace event for parsing.
+
+    Only the layers that parsing mutates are copied (the event dict itself,
+    its tool_calls list and each tool call's 'function' dict); nested values
+    like content strings are shared with the caller's objects.
+    """
+    if not isinstance(event, dict):
+        return event
+    event = dict(event)
+    metadata = event.get("metadata")
+    if type(metadata) is dict:
+        event["metadata"] = dict(metadata)
+    tool_calls = event.get("tool_calls")
+    if type(tool_calls) is list:
+        event["tool_calls"] = [
+            {**tc, "function": dict(tc["function"])}
+            if isinstance(tc, dict) and isinstance(tc.get("function"), dict)
+            else tc
+            for tc in tool_calls
+        ]
+    return event
+
+
+def parse_tool_call(tc):
+    """Builds a ToolCall from a raw dict without full pydantic validation."""
+    if not isinstance(tc, dict):
+        return tc
+    tc = dict(tc)
+    function = tc.get("function")
+    if isinstance(function, dict):
+        tc["function"] = Function.model_construct(**function)
+    return ToolCall.model_construct(**tc)
+
+
 def inputcopy(opj):
     # recursively copy, dict, list and tuple, and delegate to deepcopy for leaf objects
     if type(opj) is dict:
@@ -196,7 +285,9 @@ class Range(BaseModel):
     the object that the range is part of).
     """
 
-    object_id: str
+    # raw id() of the referenced object (int comparison avoids allocating
+    # a decimal string per created or matched range)
+    object_id: int
     start: Optional[int]
     end: Optional[int]
 
@@ -208,10 +299,10 @@ class Range(BaseModel):
     def from_object(cls, obj, start=None, end=None):
         if type(obj) is dict and "__origin__" in obj:
             obj = obj["__origin__"]
-        return cls(object_id=str(id(obj)), start=start, end=end)
+        return cls(object_id=id(obj), start=start, end=end)
 
     def match(self, obj):
-        return str(id(obj)) == self.object_id
+        return id(obj) == self.object_id
 
 
 class InputVisitor:
@@ -219,6 +310,9 @@ class InputVisitor:
         self.data = data
         self.visited = set()
 
+    def process(self, object, path):
+        """Called once for every visited object (overridden by subclasses)."""
+
     def visit(self, object=None, path=None):
         # root call defaults
         if object is None:
@@ -226,24 +320,30 @@ class InputVisitor:
         if path is None:
             path = []
 
-        # prevent infinite recursion
-        if id(object) in self.visited:
-            return
-        self.visited.add(id(object))
+        # iterative traversal with an explicit worklist, so deeply nested
+        # inputs neither allocate a frame per node nor hit the recursion limit
+        stack = [(object, path)]
+        while stack:
+            object, path = stack.pop()
 
-        if type(object) is dict:
-            for k in object:
-                self.visit(object[k], path + [k])
-        elif type(object) is list:
-            for i, v in enumerate(object):
-                self.visit(v, path + [i])
-        elif isinstance(object, BaseModel):
-            # get pydantic model fields
-            fields = object.model_fields
-            for field in fields:
-                self.visit(getattr(object, field), path + [field])
-        else:
-            return  # nop
+            # prevent infinite recursion
+            if id(object) in self.visited:
+                continue
+            self.visited.add(id(object))
+
+            self.process(object, path)
+
+            # children are pushed in reverse, so they are visited in order
+            if type(object) is dict:
+                for k in reversed(list(object)):
+                    stack.append((object[k], path + [k]))
+            elif type(object) is list:
+                for i in reversed(range(len(object))):
+                    stack.append((object[i], path + [i]))
+            elif isinstance(object, BaseModel):
+                # get pydantic model fields
+                for field in reversed(list(object.model_fields)):
+                    stack.append((getattr(object, field), path + [field]))
 
 
 class RangeLocator(InputVisitor):
@@ -255,21 +355,15 @@ class RangeLocator(InputVisitor):
             self.ranges_by_object_id.setdefault(r.object_id, []).append(r)
         self.results = []
 
-    def visit(self, object=None, path=None):
-        if object is None:
-            object = self.data
-        if path is None:
-            path = []
-
-        if str(id(object)) in self.ranges_by_object_id:
-            for r in self.ranges_by_object_id[str(id(object))]:
+    def process(self, object, path):
+        ranges = self.ranges_by_object_id.get(id(object))
+        if ranges:
+            for r in ranges:
                 rpath = ".".join(map(str, path))
                 if r.start is not None and r.end is not None:
                     rpath += ":" + str(r.start) + "-" + str(r.end)
                 self.results.append((r, rpath))
 
-        super().visit(object, path)
-
 
 def mask_json_paths(input: list[dict], json_paths: list[str], mask_fn: Callable):
     def find_next(rpath: str) -> list[str]:
@@ -289,7 +383,7 @@ def mask_json_paths(input: list[dict], json_paths: list[str], mask_fn: Callable)
         if type(object) is str:
             new_object = copy.deepcopy(object)
             for next_path in next_paths:
-                match = re.match(r"^(\d+)-(\d+)$", next_path)
+                match = RANGE_PATTERN.match(next_path)
                 if match:
                     start, end = map(int, match.groups())
                     new_object = (
@@ -320,8 +414,11 @@ class Input(Selectable):
 
     def __init__(self, input: list[dict]):
         self.data = self.parse_input(input)
-        # creates a dataflow graph from the input
-        self.dataflow = Dataflow.from_input(self.data)
+        # creates a dataflow graph from the input (parse_input always returns
+        # a single top-level list, so the shape detection in
+        # InputProcessor.process is not needed here)
+        self.dataflow = Dataflow()
+        self.dataflow.visit_top_level(self.data)
 
     def locate(self, ranges: list[Range], object=None, path=None, results=None):
         locator = RangeLocator(ranges, self.data)
@@ -336,32 +433,52 @@ class Input(Selectable):
     def to_json(self):
         return json.dumps([event.model_dump_json() for event in self.data])
 
-    def parse_input(self, input: list[dict]) -> list[Event]:
+    def parse_input(self, input: list[dict], validate: bool = False) -> list[Event]:
         """Parses input data given as list of dictionaries and transforms it into list of Event objects (Message, ToolCall or ToolOutput).
 
         Args:
             input: List of dictionaries representing the raw input data (for example, as received from the user).
+            validate: If True, events are constructed with full pydantic validation. By default,
+                      the models are built via model_construct, which skips per-field validation
+                      (the dominant cost on long traces) and assumes schema-conforming input.
         """
-        input = deepcopy(input)
+        # shallow clones are sufficient here: pydantic validation copies all
+        # nested containers into the constructed models, so a full deepcopy
+        # of the raw trace only duplicated work
+        input = [clone_event(event) for event in input]
         parsed_data = []
         tool_calls = {}
         last_call_id = None
 
+        def append_event(event_obj):
+            # assign the trace index as events are parsed, instead of in a
+            # separate pass over the parsed result
+            event_obj.metadata["trace_idx"] = len(parsed_data)
+            parsed_data.append(event_obj)
+
         for message_idx, event in enumerate(input):
             try:
                 if not isinstance(event, dict):
-                    parsed_data.append(event)
+                    append_event(event)
                     continue
                 if "role" in event:
                     if event["role"] != "tool":
                         # If arguments are given as string convert them into dict using json.loads(...)
-                        for call in event.get("tool_calls", []):
-                            if type(call["function"]["arguments"]) == str:
-                                call["function"]["arguments"] = json.loads(
-                                    call["function"]["arguments"]
-                                )
-                        msg = Message(**event)
-                        parsed_data.append(msg)
+                        # (no default [] here: that would allocate a list per message without tool calls)
+                        calls = event.get("tool_calls")
+                        if calls:
+                            for call in calls:
+                                if type(call["function"]["arguments"]) == str:
+                                    call["function"]["arguments"] = json.loads(
+                                        call["function"]["arguments"]
+                                    )
+                        if validate:
+                            msg = Message(**event)
+                        else:
+                            if calls:
+                                event["tool_calls"] = [parse_tool_call(call) for call in calls]
+                            msg = Message.model_construct(**event)
+                        append_event(msg)
                         if msg.tool_calls is not None:
                             for call in msg.tool_calls:
                                 last_call_id = call.id
@@ -369,15 +486,15 @@ class Input(Selectable):
                     else:
                         if "tool_call_id" not in event:
                             event["tool_call_id"] = last_call_id
-                        out = ToolOutput(**event)
+                        out = ToolOutput(**event) if validate else ToolOutput.model_construct(**event)
                         if out.tool_call_id in tool_calls:
                             out._tool_call = tool_calls[out.tool_call_id]
-                        parsed_data.append(out)
+                        append_event(out)
                 elif "type" in event:
-                    call = ToolCall(**event)
+                    call = ToolCall(**event) if validate else parse_tool_call(event)
                     last_call_id = call.id
                     tool_calls[call.id] = call
-                    parsed_data.append(call)
+                    append_event(call)
                 else:
                     raise ValueError(
                         "Could not parse event in the trace as any of the event types (Message, ToolCall, ToolOutput): "
@@ -387,8 +504,6 @@ class Input(Selectable):
                 warnings.warn(f"Could not parse event in the trace: {event}!")
                 raise e
 
-        for trace_idx, event in enumerate(parsed_data):
-            event.metadata["trace_idx"] = trace_idx
         return parsed_data
 
     def has_flow(self, a, b):
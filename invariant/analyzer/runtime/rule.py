@@ -170,9 +170,11 @@ class FunctionCache:
         # if function is not marked with @cache we just call it directly (see ./functions.py module)
         if not hasattr(function, "__invariant_cache__"):
             return function(*args, **kwargs)
-        if not self.contains(function, args, kwargs):
-            self.cache[self.call_key(function, args, kwargs)] = function(*args, **kwargs)
-        return self.cache[self.call_key(function, args, kwargs)]
+        # compute the (potentially deep) call key only once per call
+        key = self.call_key(function, args, kwargs)
+        if key not in self.cache:
+            self.cache[key] = function(*args, **kwargs)
+        return self.cache[key]
 
 
 class InputEvaluationContext(EvaluationContext):
@@ -307,6 +309,13 @@ class frozen_dict:
     def __getitem__(self, key):
         return self.base_dict[key]
 
+    def __contains__(self, key):
+        # without this, 'in' falls back to __iter__ and scans linearly
+        return key in self.base_dict
+
+    def get(self, key, default=None):
+        return self.base_dict.get(key, default)
+
     def __setitem__(self, key, value):
         assert False, "cannot modify frozen dictionary"
 
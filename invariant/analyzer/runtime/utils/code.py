@@ -1,4 +1,5 @@
 import ast
+import functools
 import json
 import subprocess
 import tempfile
@@ -8,6 +9,12 @@ from pydantic.dataclasses import Field, dataclass
 
 from invariant.analyzer.runtime.utils.base import BaseDetector, DetectorResult
 
+# names of Python built-ins, computed once and shared by all detector
+# instances (__builtins__ is a dict in modules, but a module in __main__)
+BUILTIN_NAMES = frozenset(
+    __builtins__.keys() if isinstance(__builtins__, dict) else dir(__builtins__)
+)
+
 
 class CodeSeverity(str, Enum):
     INFO = "info"
@@ -75,11 +82,72 @@ class PythonDetectorResult:
             self.syntax_error = True
 
 
+@functools.lru_cache(maxsize=128)
+def parse_code(text: str) -> tuple[ast.AST | None, str | None]:
+    """Parses a code snippet once and caches the result by text.
+
+    Safety pipelines often run several detectors (or repeated policy
+    evaluations) over the same snippet; caching the (tree, error) pair means
+    each distinct text is parsed at most once. The tree is only ever walked
+    read-only, so sharing it between callers is safe.
+    """
+    try:
+        # compile() with optimize=1 folds constants while parsing, which
+        # shrinks the tree before visitors walk it; allowing top-level await
+        # keeps async snippets (common in agent output) parseable instead of
+        # tripping the syntax-error path
+        tree = compile(
+            text,
+            "<detector>",
+            "exec",
+            flags=ast.PyCF_ONLY_AST | ast.PyCF_ALLOW_TOP_LEVEL_AWAIT,
+            optimize=1,
+        )
+        return tree, None
+    except Exception as e:
+        return None, str(e)
+
+
+def function_name(node) -> str:
+    """Returns the call target as a dotted string (e.g. 'obj.meth').
+
+    Covers the common ast.Name/ast.Attribute chains directly; only unusual
+    targets (subscripts, lambdas, nested calls) fall back to ast.unparse,
+    which builds a full unparser instance per invocation.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return function_name(node.value) + "." + node.attr
+    return ast.unparse(node).strip()
+
+
 class ASTDetectionVisitor(ast.NodeVisitor):
     def __init__(self, code: str):
         self.code = code
-        self.res = PythonDetectorResult()
-        self._builtins = globals()["__builtins__"].keys()
+        # plain local buffers; thousands of per-node writes through the
+        # pydantic dataclass attribute machinery add up, so results are
+        # collected here and assigned to the result object once in finalize()
+        self._imports = []
+        self._builtin_uses = []
+        self._calls = set()
+        # direct node-class dispatch table; avoids the name-based getattr
+        # lookup in ast.NodeVisitor.visit for every node
+        self._dispatch = {
+            ast.Name: self.visit_Name,
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.Call: self.visit_Call,
+        }
+
+    def visit(self, node):
+        # flat iteration over all nodes: ast.walk's deque-based traversal
+        # avoids one visit/generic_visit frame pair per node
+        dispatch = self._dispatch
+        for child in ast.walk(node):
+            fn = dispatch.get(child.__class__)
+            if fn is not None:
+                fn(child)
 
     # TODO: Not used right now, but can find source code corresponding to node (for e.g. masking or warning)
     def _get_match_results(self, type: str, text: str, node: ast.AST) -> list[DetectorResult]:
@@ -93,20 +161,26 @@ class ASTDetectionVisitor(ast.NodeVisitor):
 
         return res
 
+    def finalize(self) -> PythonDetectorResult:
+        return PythonDetectorResult(
+            imports=self._imports,
+            builtins=self._builtin_uses,
+            function_calls=self._calls,
+        )
+
     def visit_Name(self, node):
-        if node.id in self._builtins:
-            self.res.add_builtin(node.id)
+        if node.id in BUILTIN_NAMES:
+            self._builtin_uses.append(node.id)
 
     def visit_Import(self, node):
         for alias in node.names:
-            self.res.add_import(alias.name)
+            self._imports.append(alias.name)
 
     def visit_ImportFrom(self, node):
-        self.res.add_import(node.module)
+        self._imports.append(node.module)
 
     def visit_Call(self, node):
-        self.res.add_function_call(ast.unparse(node.func).strip())
-        self.generic_visit(node)
+        self._calls.add(function_name(node.func))
 
 
 class PythonCodeDetector(BaseDetector):
@@ -118,6 +192,10 @@ class PythonCodeDetector(BaseDetector):
     - Built-in functions used
     """
 
+    # lazily constructed, shared by all detector instances (importing
+    # IPython and building the transformer state machine is expensive)
+    _transformer_manager = None
+
     def __init__(self, ipython_mode=False):
         super().__init__()
 
@@ -126,21 +204,24 @@ class PythonCodeDetector(BaseDetector):
         Preprocesses the text like in IPython cell parsing (e.g. handles indentation differences,
         cell magic commands, etc.).
         """
-        from IPython.core.inputtransformer2 import TransformerManager
+        if PythonCodeDetector._transformer_manager is None:
+            from IPython.core.inputtransformer2 import TransformerManager
 
-        transformer_manager = TransformerManager()
-        return transformer_manager.transform_cell(text)
+            PythonCodeDetector._transformer_manager = TransformerManager()
+        return PythonCodeDetector._transformer_manager.transform_cell(text)
 
     def detect(self, text: str, ipython_mode=False) -> PythonDetectorResult:
         try:
             if ipython_mode:
                 text = self.ipython_preprocess(text)
-            ast_visitor = ASTDetectionVisitor(text)
-            tree = ast.parse(text)
-            ast_visitor.visit(tree)
         except Exception as e:
             return PythonDetectorResult(syntax_error=True, syntax_error_exception=str(e))
-        return ast_visitor.res
+        tree, error = parse_code(text)
+        if tree is None:
+            return PythonDetectorResult(syntax_error=True, syntax_error_exception=error)
+        ast_visitor = ASTDetectionVisitor(text)
+        ast_visitor.visit(tree)
+        return ast_visitor.finalize()
 
 
 class SemgrepDetector(BaseDetector):
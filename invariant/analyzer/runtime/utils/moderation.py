@@ -1,3 +1,5 @@
+import os
+
 from invariant.analyzer.runtime.utils.base import BaseDetector, DetectorResult
 from typing import Optional
 from typing_extensions import override
@@ -33,6 +35,24 @@ MODERATION_CATEGORIES_INV = {
     provider: {v: k for k, v in provider_mapping.items()} for provider, provider_mapping in MODERATION_CATEGORIES.items()
 }
 
+# per-provider label maps, resolved once at import instead of through the
+# nested MODERATION_CATEGORIES dict on every scored chunk
+OPENAI_CATEGORIES = MODERATION_CATEGORIES["OpenAI"]
+KOALAAI_CATEGORIES = MODERATION_CATEGORIES["KoalaAI/Text-Moderation"]
+
+# shared pool for I/O-bound detector calls (remote moderation endpoints);
+# created lazily so importing this module never spawns threads
+_IO_EXECUTOR = None
+
+
+def _io_executor():
+    global _IO_EXECUTOR
+    if _IO_EXECUTOR is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _IO_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="invariant-detector-io")
+    return _IO_EXECUTOR
+
 class ModerationAnalyzer(BaseDetector):
 
     def __init__(self):
@@ -42,7 +62,42 @@ class ModerationAnalyzer(BaseDetector):
         if model == "OpenAI":
             return
         pipeline = transformers_extra.package("transformers").import_names("pipeline")
-        self.pipe_store[model] = pipeline("text-classification", model=model, top_k=None)
+
+        # INVARIANT_MODERATION_ONNX opts into the ONNX Runtime backend
+        # (requires the 'optimum' package): the exported graph fuses ops and
+        # avoids the per-call overhead of the eager torch forward. The ORT
+        # model drops into the regular pipeline, so batching and
+        # postprocessing stay unchanged.
+        if os.environ.get("INVARIANT_MODERATION_ONNX"):
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+
+            AutoTokenizer = transformers_extra.package("transformers").import_names("AutoTokenizer")
+            ort_model = ORTModelForSequenceClassification.from_pretrained(model, export=True)
+            tokenizer = AutoTokenizer.from_pretrained(model)
+            self.pipe_store[model] = pipeline(
+                "text-classification", model=ort_model, tokenizer=tokenizer, top_k=None
+            )
+            return
+
+        # INVARIANT_MODERATION_FAST opts into reduced-precision inference:
+        # bf16/fp16 on GPU (roughly halves latency and memory of the forward),
+        # dynamic int8 quantization of the linear layers on CPU. Off by
+        # default to preserve exact fp32 scores.
+        if os.environ.get("INVARIANT_MODERATION_FAST"):
+            torch = transformers_extra.package("torch").import_module()
+            if torch.cuda.is_available():
+                dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+                self.pipe_store[model] = pipeline(
+                    "text-classification", model=model, top_k=None, device=0, torch_dtype=dtype
+                )
+            else:
+                pipe = pipeline("text-classification", model=model, top_k=None)
+                pipe.model = torch.quantization.quantize_dynamic(
+                    pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                self.pipe_store[model] = pipe
+        else:
+            self.pipe_store[model] = pipeline("text-classification", model=model, top_k=None)
 
     def _has_model(self, model):
         return model in self.pipe_store
@@ -51,30 +106,32 @@ class ModerationAnalyzer(BaseDetector):
         # NOTE: OpenAI suggests: for higher accuracy, try splitting long pieces of text into smaller chunks each less than 2,000 characters.
         moderated = client.moderations.create(input=text)
         scores = moderated.results[0].category_scores.to_dict()
-        scores = {MODERATION_CATEGORIES["OpenAI"][cat]: score for cat, score in scores.items() if cat in MODERATION_CATEGORIES["OpenAI"]}
+        scores = {OPENAI_CATEGORIES[cat]: score for cat, score in scores.items() if cat in OPENAI_CATEGORIES}
         return scores
 
     def moderate_koalaai(self, pipe, text: str):
-        scores = pipe(text)
-        scores = {MODERATION_CATEGORIES["KoalaAI/Text-Moderation"][score["label"]]: score["score"] for score in scores[0] if score["label"] != "OK"}
-        return scores
+        return self.moderate_koalaai_batch(pipe, [text])[0]
 
-    def detect_all(self, text: str, split="\n", model=DEFAULT_MODERATION_MODEL, default_threshold=0.5, cat_thresholds: Optional[dict]=None) -> list[DetectorResult]:
-        """Detects whether the text matches any of the categories that should be moderated.
-
-        Args:
-            text: The text to analyze.
-            split: The delimiter to split the text into chunks.
-            model: The model to use for moderation detection.
-            default_threshold: The threshold for the model score above which text is considered to be moderated.
-            cat_thresholds: A dictionary of category-specific thresholds.
+    def moderate_koalaai_batch(self, pipe, texts: list[str]) -> list[dict]:
+        """Scores all texts in a single pipeline call.
 
-        Returns:
-            A list of DetectorResult objects, each representing a substring that should be moderated.
+        The tokenizer and model forward are launched once for the whole batch
+        instead of once per chunk; sorting by length first keeps padding within
+        each batch minimal.
         """
-        if not self._has_model(model):
-            self._load_model(model)
-
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        outputs = pipe([texts[i] for i in order], batch_size=16, truncation=True)
+        categories = KOALAAI_CATEGORIES
+        results: list[dict] = [None] * len(texts)
+        for i, scores in zip(order, outputs):
+            results[i] = {
+                categories[score["label"]]: score["score"]
+                for score in scores
+                if score["label"] != "OK"
+            }
+        return results
+
+    def _chunk_text(self, text: str, split: Optional[str]) -> list[str]:
         # split by a delimiter
         # TODO: Invariant Language doesn't support split=\n, so let's always split for now
         if split is not None:
@@ -91,28 +148,93 @@ class ModerationAnalyzer(BaseDetector):
                 text_chunks.append(chunk)
 
         assert len(text) == sum([len(chunk) for chunk in text_chunks])
+        return text_chunks
+
+    def detect_all(self, text: str, split="\n", model=DEFAULT_MODERATION_MODEL, default_threshold=0.5, cat_thresholds: Optional[dict]=None) -> list[DetectorResult]:
+        """Detects whether the text matches any of the categories that should be moderated.
+
+        Args:
+            text: The text to analyze.
+            split: The delimiter to split the text into chunks.
+            model: The model to use for moderation detection.
+            default_threshold: The threshold for the model score above which text is considered to be moderated.
+            cat_thresholds: A dictionary of category-specific thresholds.
+
+        Returns:
+            A list of DetectorResult objects, each representing a substring that should be moderated.
+        """
+        return self.detect_all_batch(
+            [text],
+            split=split,
+            model=model,
+            default_threshold=default_threshold,
+            cat_thresholds=cat_thresholds,
+        )[0]
+
+    def detect_all_batch(self, texts: list[str], split="\n", model=DEFAULT_MODERATION_MODEL, default_threshold=0.5, cat_thresholds: Optional[dict]=None) -> list[list[DetectorResult]]:
+        """Like detect_all, but analyzes several texts with one classifier call.
+
+        All chunks of all texts are scored in a single batched pipeline
+        invocation, so per-call launch overhead is paid once per chat rather
+        than once per message.
+
+        Returns:
+            One list of DetectorResult objects per input text.
+        """
+        if not self._has_model(model):
+            self._load_model(model)
+
+        # identical texts (echoed system prompts, retried tool outputs) are
+        # scored once and their results shared
+        unique_texts = list(dict.fromkeys(texts))
+        if len(unique_texts) < len(texts):
+            by_text = dict(zip(unique_texts, self.detect_all_batch(
+                unique_texts,
+                split=split,
+                model=model,
+                default_threshold=default_threshold,
+                cat_thresholds=cat_thresholds,
+            )))
+            return [by_text[text] for text in texts]
+
+        chunks_per_text = [self._chunk_text(text, split) for text in texts]
+        flat_chunks = [chunk for chunks in chunks_per_text for chunk in chunks]
 
-        res = []
-        pos = 0
         if model == "OpenAI":
             import openai
             client = openai.Client()
-        for chunk in text_chunks:
-            if model == "OpenAI":
-                scores = self.moderate_openai(client, chunk)
-            elif model == "KoalaAI/Text-Moderation":
-                scores = self.moderate_koalaai(self.pipe_store[model], chunk)
+            if len(flat_chunks) > 1:
+                # the moderation endpoint is called once per chunk; firing the
+                # requests concurrently makes the wall-clock cost the slowest
+                # request rather than the sum (executor.map preserves order)
+                flat_scores = list(
+                    _io_executor().map(lambda chunk: self.moderate_openai(client, chunk), flat_chunks)
+                )
             else:
-                raise ValueError(f"Model {model} not supported.")
-
-            flagged = None
-            for cat in MODERATION_CATEGORIES_INV[model]:
-                if scores[cat] > default_threshold:
-                    flagged = cat
-                if cat_thresholds and cat in cat_thresholds and scores[cat] > cat_thresholds[cat]:
-                    flagged = cat
-            if flagged:
-                res.append(DetectorResult(flagged, pos, pos + len(chunk)))
-            pos += len(chunk)
-        return res
+                flat_scores = [self.moderate_openai(client, chunk) for chunk in flat_chunks]
+        elif model == "KoalaAI/Text-Moderation":
+            flat_scores = self.moderate_koalaai_batch(self.pipe_store[model], flat_chunks)
+        else:
+            raise ValueError(f"Model {model} not supported.")
+
+        results = []
+        offset = 0
+        get_threshold = cat_thresholds.get if cat_thresholds else None
+        for chunks in chunks_per_text:
+            res = []
+            pos = 0
+            for chunk in chunks:
+                scores = flat_scores[offset]
+                offset += 1
+
+                # single pass over the scores with an early exit on the first
+                # category above its threshold
+                for cat, score in scores.items():
+                    threshold = get_threshold(cat, default_threshold) if get_threshold else default_threshold
+                    if score > threshold:
+                        res.append(DetectorResult(cat, pos, pos + len(chunk)))
+                        break
+                pos += len(chunk)
+            results.append(res)
+        return results
 
@@ -1,18 +1,65 @@
+from functools import lru_cache
+
 from invariant.analyzer.runtime.utils.base import BaseDetector
 from invariant.analyzer.extras import presidio_extra
 
 
+@lru_cache(maxsize=1)
+def _get_analyzer_engine():
+    # constructing an AnalyzerEngine loads the full spaCy model, so the
+    # engine is built once per process and shared by all PII_Analyzer
+    # instances
+    AnalyzerEngine = presidio_extra.package("presidio_analyzer").import_names('AnalyzerEngine')
+    return AnalyzerEngine()
+
+
+def warm_up():
+    """Builds the shared analyzer engine in a background thread.
+
+    Called when the stdlib pii detector is loaded, so the expensive spaCy
+    model load overlaps with policy parsing instead of delaying the first
+    pii(...) evaluation. Best-effort: any error is deferred to first use.
+    """
+    import threading
+
+    def _warm():
+        try:
+            _get_analyzer_engine()
+        except Exception:
+            pass
+
+    threading.Thread(target=_warm, daemon=True).start()
+
+
 class PII_Analyzer(BaseDetector):
-    
+
     def __init__(self, threshold=0.5):
-        AnalyzerEngine = presidio_extra.package("presidio_analyzer").import_names('AnalyzerEngine')
-        self.analyzer = AnalyzerEngine()
+        self.analyzer = _get_analyzer_engine()
         self.threshold = threshold
+        # identical content recurs frequently across messages and rule
+        # evaluations (echoed system prompts, retried tool outputs); caching
+        # per (text, entities) pair turns those repeats into a dict lookup
+        # instead of a full spaCy pipeline run. RecognizerResult objects are
+        # pure data, so sharing the cached list is safe.
+        self._analyze_cached = lru_cache(maxsize=1024)(self._analyze_uncached)
 
-    def detect_all(self, text: str, entities: list[str] | None = None):
-        results = self.analyzer.analyze(text, language='en', entities=entities)
+    def _analyze_uncached(self, text: str, entities: tuple[str, ...] | None):
+        results = self.analyzer.analyze(text, language='en', entities=list(entities) if entities is not None else None)
         res_matches = set()
         for res in results:
             if res.score > self.threshold:
                 res_matches.add(res)
-        return list(res_matches)
\ No newline at end of file
+        return list(res_matches)
+
+    def detect_all(self, text: str, entities: list[str] | None = None):
+        return self._analyze_cached(text, tuple(entities) if entities is not None else None)
+
+    def detect_all_batch(self, texts: list[str], entities: list[str] | None = None) -> list[list]:
+        """Analyzes several texts in one call, returning results in input order.
+
+        Duplicate texts within the batch are analyzed only once via the
+        per-text cache. Also the single place to hook in remote or truly
+        batched analysis backends later.
+        """
+        entities_key = tuple(entities) if entities is not None else None
+        return [self._analyze_cached(text, entities_key) for text in texts]
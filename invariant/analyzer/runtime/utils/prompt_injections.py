@@ -1,8 +1,40 @@
+import re
+import sys
 import unicodedata
+from functools import lru_cache
 from invariant.analyzer.runtime.utils.base import BaseDetector, DetectorResult
 from typing import Optional
 from invariant.analyzer.extras import transformers_extra
 
+
+@lru_cache(maxsize=16)
+def _category_pattern(categories: frozenset) -> re.Pattern:
+    """Compiles a character class covering all codepoints in the categories.
+
+    Building the class scans the whole Unicode range once per distinct
+    category set and is cached for the life of the process; scanning text
+    with the compiled class then runs inside the regex engine instead of a
+    per-character Python loop.
+    """
+    parts = []
+    start = None
+    prev = None
+    for codepoint in range(sys.maxunicode + 1):
+        if unicodedata.category(chr(codepoint)) in categories:
+            if start is None:
+                start = codepoint
+            prev = codepoint
+        elif start is not None:
+            parts.append(f"\\U{start:08x}-\\U{prev:08x}" if prev > start else f"\\U{start:08x}")
+            start = None
+    if start is not None:
+        parts.append(f"\\U{start:08x}-\\U{prev:08x}" if prev > start else f"\\U{start:08x}")
+    if not parts:
+        # empty or unknown category set: "[]" is invalid regex syntax, so
+        # compile a never-matching pattern instead
+        return re.compile(r"(?!)")
+    return re.compile("[" + "".join(parts) + "]")
+
 DEFAULT_PI_MODEL = "protectai/deberta-v3-base-prompt-injection-v2"
 
 
@@ -94,9 +126,14 @@ class UnicodeDetector(BaseDetector):
         Raises:
             ValueError: If both allow and deny categories are specified.
         """
-        res = []
-        for index, chr in enumerate(text):
-            cat = unicodedata.category(chr)
-            if categories is None or cat in categories:
-                res.append(DetectorResult(cat, index, index+1))
-        return res
+        category = unicodedata.category
+        if categories is None:
+            return [DetectorResult(category(chr), index, index + 1) for index, chr in enumerate(text)]
+        # with a deny-list, matching characters are typically rare: let the
+        # compiled character class skip the benign bulk of the text at
+        # regex-engine speed and only touch hits from Python
+        pattern = _category_pattern(frozenset(categories))
+        return [
+            DetectorResult(category(match.group()), match.start(), match.start() + 1)
+            for match in pattern.finditer(text)
+        ]
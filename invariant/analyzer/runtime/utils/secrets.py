@@ -24,6 +24,18 @@ SECRETS_PATTERNS = {
     ],
 }
 
+# fixed lowercase substrings such that every pattern in SECRETS_PATTERNS
+# contains at least one of them; must be kept in sync when patterns change.
+# str-in-str is a fast memchr-style scan, so text containing no candidate
+# (the common case) never reaches the regex engine at all.
+LITERAL_CORES = (
+    "ghp_", "gho_", "ghu_", "ghs_", "ghr_",  # GitHub tokens
+    "a3t", "abia", "acca", "akia", "asia", "aws",  # AWS access keys
+    "accountkey=",  # Azure storage keys
+    "xox", "hooks.slack.com",  # Slack tokens and webhooks
+)
+
+
 @dataclass
 class SecretPattern:
     secret_name: str
@@ -34,20 +46,58 @@ class SecretsAnalyzer(BaseDetector):
     """
     Analyzer for detecting secrets in generated text.
     """
+    # compiled state shared by all analyzer instances; SECRETS_PATTERNS is
+    # static, so the alternation only ever needs to be built once per process
+    _compiled_cache = None
+
     def __init__(self):
         super().__init__()
         self.secrets = self.get_recognizers()
+        if SecretsAnalyzer._compiled_cache is None:
+            SecretsAnalyzer._compiled_cache = self._combine_patterns()
+        self._combined, self._group_to_secret = SecretsAnalyzer._compiled_cache
 
     def get_recognizers(self) -> list[Pattern]:
         secrets = []
         for secret_name, regex_pattern in SECRETS_PATTERNS.items():
             secrets.append(SecretPattern(secret_name, regex_pattern))
         return secrets
-    
+
+    def _combine_patterns(self) -> tuple[Pattern, dict[str, str]]:
+        """Joins all secret patterns into one named alternation.
+
+        A single compiled alternation walks the text once for all patterns
+        instead of once per pattern. Patterns compiled with re.IGNORECASE keep
+        their case-insensitivity through a scoped (?i:...) group, so the
+        per-pattern flag semantics are preserved.
+        """
+        parts = []
+        group_to_secret = {}
+        for secret_name, patterns in SECRETS_PATTERNS.items():
+            for i, pattern in enumerate(patterns):
+                group = f"{secret_name}_{i}"
+                body = pattern.pattern
+                if pattern.flags & re.IGNORECASE:
+                    body = f"(?i:{body})"
+                parts.append(f"(?P<{group}>{body})")
+                group_to_secret[group] = secret_name
+        return re.compile("|".join(parts)), group_to_secret
+
     def detect_all(self, text: str) -> list[DetectorResult]:
+        # literal prescan: skip the regex entirely when no pattern's fixed
+        # core occurs in the text (case-folded, so this can only
+        # over-approximate, never miss)
+        lowered = text.lower()
+        if not any(core in lowered for core in LITERAL_CORES):
+            return []
+
         res = []
-        for secret in self.secrets:
-            for pattern in secret.patterns:
-                for match in pattern.finditer(text):
-                    res.append(DetectorResult(secret.secret_name, match.start(), match.end()))
+        for match in self._combined.finditer(text):
+            # match.lastgroup is unreliable here (several patterns contain
+            # unnamed inner groups), so resolve the matched alternative by
+            # checking each named top-level group
+            for group, secret_name in self._group_to_secret.items():
+                if match.group(group) is not None:
+                    res.append(DetectorResult(secret_name, match.start(), match.end()))
+                    break
         return res
@@ -0,0 +1,34 @@
+"""Shared input normalization for the stdlib detector and parser predicates."""
+
+from invariant.analyzer.stdlib.invariant.nodes import ToolCall
+
+
+def _as_chat(data) -> list:
+    """Normalizes a predicate's data argument to a list of messages."""
+    if isinstance(data, list):
+        return data
+    if type(data) is str:
+        return [{"content": data}]
+    return [data]
+
+
+def _iter_message_contents(data):
+    """Yields (message, content) pairs for each message with textual content.
+
+    Accepts a single string, a single message-like object, or a list of
+    either. None entries and messages without content are skipped; dict and
+    object messages are handled uniformly, and ToolCall objects are rendered
+    via str() so their arguments are scanned too.
+    """
+    for message in _as_chat(data):
+        if message is None:
+            continue
+        if type(message) is ToolCall:
+            content = str(message)
+        elif type(message) is dict:
+            content = message.get("content")
+        else:
+            content = getattr(message, "content", None)
+        if content is None:
+            continue
+        yield message, content
@@ -1,5 +1,6 @@
 from invariant.analyzer.runtime.functions import cache
 from invariant.analyzer.runtime.utils.code import *
+from invariant.analyzer.stdlib.invariant.chat import _iter_message_contents
 
 PYTHON_ANALYZER = None
 SEMGREP_DETECTOR = None
@@ -17,14 +18,10 @@ def python_code(
 
     if type(data) is str:
         return PYTHON_ANALYZER.detect(data, **config)
-    if type(data) is not list:
-        data = [data]
 
     res = PythonDetectorResult()
-    for message in data:
-        if message.content is None:
-            continue
-        res.extend(PYTHON_ANALYZER.detect(message.content, **config))
+    for _, content in _iter_message_contents(data):
+        res.extend(PYTHON_ANALYZER.detect(content, **config))
     return res
 
 
@@ -45,13 +42,7 @@ def semgrep(data: str | list | dict, **config: dict) -> list[CodeIssue]:
     if type(data) is str:
         return SEMGREP_DETECTOR.detect_all(data, **config)
 
-    chat = (
-        data if isinstance(data, list) else ([{"content": data}] if type(data) == str else [data])
-    )
-
     res = []
-    for message in chat:
-        if message.content is None:
-            continue
-        res.extend(SEMGREP_DETECTOR.detect_all(message.content, **config))
+    for _, content in _iter_message_contents(data):
+        res.extend(SEMGREP_DETECTOR.detect_all(content, **config))
     return res
@@ -1,4 +1,5 @@
 from invariant.analyzer.runtime.functions import cache
+from invariant.analyzer.stdlib.invariant.chat import _iter_message_contents
 
 COPYRIGHT_ANALYZER = None
 
@@ -20,13 +21,9 @@ def copyright(data: str | list, **config) -> list[str]:
 
     if type(data) is str:
         return COPYRIGHT_ANALYZER.get_entities(COPYRIGHT_ANALYZER.detect_all(data))
-    if type(data) is not list:
-        data = [data]
 
     all_copyright = []
-    for message in data:
-        if message.content is None:
-            continue
-        res = COPYRIGHT_ANALYZER.detect_all(message.content)
+    for _, content in _iter_message_contents(data):
+        res = COPYRIGHT_ANALYZER.detect_all(content)
         all_copyright.extend(COPYRIGHT_ANALYZER.get_entities(res))
     return all_copyright
@@ -1,6 +1,7 @@
 from invariant.analyzer.runtime.functions import cache
 from invariant.analyzer.runtime.utils.base import DetectorResult
 from invariant.analyzer.runtime.utils.moderation import ModerationAnalyzer
+from invariant.analyzer.stdlib.invariant.chat import _iter_message_contents
 
 MODERATION_ANALYZER = None
 
@@ -32,15 +33,16 @@ def moderated(data: str | list | dict, **config: dict) -> bool:
 
     if type(data) is str:
         return parse_moderation(data, MODERATION_ANALYZER.detect_all(data, **config), interpreter)
-    if type(data) is not list:
-        data = [data]
+
+    # analyze all message contents with one batched classifier call, so the
+    # underlying pipeline pays tokenizer and forward launch overhead once per
+    # chat instead of once per message
+    contents = [content for _, content in _iter_message_contents(data)]
+    if not contents:
+        return False
 
     moderated = False
-    for message in data:
-        if message is None or message.content is None:
-            continue
-        if parse_moderation(
-            message.content, MODERATION_ANALYZER.detect_all(message.content, **config), interpreter
-        ):
+    for content, results in zip(contents, MODERATION_ANALYZER.detect_all_batch(contents, **config)):
+        if parse_moderation(content, results, interpreter):
             moderated = True
     return moderated
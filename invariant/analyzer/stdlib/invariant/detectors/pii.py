@@ -1,10 +1,21 @@
+import importlib.util
 from dataclasses import dataclass
 
 from invariant.analyzer.runtime.functions import cache
+from invariant.analyzer.stdlib.invariant.chat import _iter_message_contents
 from invariant.analyzer.stdlib.invariant.nodes import LLM
 
 PII_ANALYZER = None
 
+# start loading the spaCy-backed analyzer engine in the background as soon as
+# this detector module is imported (i.e. at policy load), so the first
+# pii(...) call doesn't pay the full cold-start cost; only when the presidio
+# extra is actually installed
+if importlib.util.find_spec("presidio_analyzer") is not None:
+    from invariant.analyzer.runtime.utils.pii import warm_up
+
+    warm_up()
+
 
 @dataclass
 class PIIException(Exception):
@@ -45,14 +56,13 @@ def pii(data: str | list, entities: list[str] | None = None) -> list[str]:
         add_ranges(data, results, interpreter)
         return get_entities(results)
 
-    if type(data) is not list:
-        data = [data]
+    # analyze all message contents through the batch entry point, which
+    # dedupes identical content within the chat
+    pairs = list(_iter_message_contents(data))
+    all_results = PII_ANALYZER.detect_all_batch([content for _, content in pairs], entities)
 
     all_pii = []
-    for message in data:
-        if message.content is None:
-            continue
-        results = PII_ANALYZER.detect_all(message.content, entities)
+    for (message, _), results in zip(pairs, all_results):
         add_ranges(message, results, interpreter)
         all_pii.extend(get_entities(results))
     return all_pii
@@ -4,6 +4,7 @@ from invariant.analyzer.runtime.utils.prompt_injections import (
     PromptInjectionAnalyzer,
     UnicodeDetector,
 )
+from invariant.analyzer.stdlib.invariant.chat import _iter_message_contents
 
 PROMPT_INJECTION_ANALYZER = None
 UNICODE_ANALYZER = None
@@ -24,13 +25,14 @@ def prompt_injection(data: str | list | dict, **config: dict) -> bool:
 
     if type(data) is str:
         return PROMPT_INJECTION_ANALYZER.detect_all(data, **config)
-    if type(data) is not list:
-        data = [data]
 
-    for message in data:
-        if message.content is None:
+    # identical content across messages only goes through the model once
+    seen = set()
+    for _, content in _iter_message_contents(data):
+        if content in seen:
             continue
-        if PROMPT_INJECTION_ANALYZER.detect(message.content, **config):
+        seen.add(content)
+        if PROMPT_INJECTION_ANALYZER.detect(content, **config):
             return True
     return False
 
@@ -56,14 +58,9 @@ def unicode(data: str | list | dict, categories: list[str] | None = None) -> boo
 
     if type(data) is str:
         return parse_unicode(data, UNICODE_ANALYZER.detect_all(data, categories), interpreter)
-    if type(data) is not list:
-        data = [data]
 
     all_unicode = []
-    for message in data:
-        txt = message.content
-        if txt is None:
-            continue
-        res = parse_unicode(txt, UNICODE_ANALYZER.detect_all(txt, categories), interpreter)
+    for _, content in _iter_message_contents(data):
+        res = parse_unicode(content, UNICODE_ANALYZER.detect_all(content, categories), interpreter)
         all_unicode.extend(res)
     return all_unicode
@@ -1,5 +1,6 @@
 from invariant.analyzer.runtime.functions import cache
 from invariant.analyzer.runtime.utils.secrets import SecretsAnalyzer
+from invariant.analyzer.stdlib.invariant.chat import _iter_message_contents
 
 SECRETS_ANALYZER = None
 
@@ -21,17 +22,12 @@ def secrets(data: str | list | dict, **config: dict) -> list[str]:
     if type(data) is str:
         return SECRETS_ANALYZER.detect_all(data, **config)
 
-    chat = (
-        data if isinstance(data, list) else ([{"content": data}] if type(data) == str else [data])
-    )
-
     all_secrets = []
-    for message in chat:
-        if message is None:
-            continue
-        if message.content is None:
-            continue
-
-        res = SECRETS_ANALYZER.detect_all(message.content, **config)
+    # identical content across messages is scanned once
+    results_by_content = {}
+    for _, content in _iter_message_contents(data):
+        res = results_by_content.get(content)
+        if res is None:
+            res = results_by_content[content] = SECRETS_ANALYZER.detect_all(content, **config)
         all_secrets.extend(SECRETS_ANALYZER.get_entities(res))
     return all_secrets
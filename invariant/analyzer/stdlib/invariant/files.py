@@ -1,3 +1,5 @@
+import fnmatch
+import os
 from pathlib import Path
 from typing import Callable, Optional
 
@@ -28,19 +30,48 @@ def get_files(workspace_path: str, path: str = ".", pattern: Optional[str] = Non
     return [file for file in path.iterdir() if file.is_file() and filter_path(file, pattern)]
 
 
+def _iter_tree_file_entries(root: Path):
+    """Yields an os.DirEntry for every file in the tree below root.
+
+    os.scandir fills the entry type from the directory listing itself, so
+    unlike Path.glob("**/*") + is_file() the walk needs no extra stat syscall
+    and no Path object per entry. Directory symlinks are not followed, which
+    also rules out traversal cycles.
+    """
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
 def get_tree_files(
     workspace_path: str, path: str = ".", pattern: Optional[str] = None
 ) -> list[str]:
     """Returns the list of files in the whole directory tree of the agent workspace."""
     path = join_paths(workspace_path, path)
-    return [file for file in path.glob("**/*") if file.is_file() and filter_path(file, pattern)]
+    # single-component patterns can reject entries on the basename alone,
+    # before a Path object is constructed; fnmatch (not fnmatchcase) applies
+    # os.path.normcase, matching Path.match's platform case semantics
+    name_pattern = pattern if pattern is not None and "/" not in pattern else None
+    files = []
+    for entry in _iter_tree_file_entries(path):
+        if name_pattern is not None and not fnmatch.fnmatch(entry.name, name_pattern):
+            continue
+        file = Path(entry.path)
+        if filter_path(file, pattern):
+            files.append(file)
+    return files
 
 
 def get_file_content(workspace_path: str, file_path: str) -> File:
     """Returns the content of a file in the agent workspace."""
     file_path = join_paths(workspace_path, file_path)
-    with open(file_path, "r") as file:
-        return File(str(file_path), file.read())
+    # read_bytes + decode skips the text-mode buffering layer
+    return File(str(file_path), file_path.read_bytes().decode())
 
 
 def get_file_contents(
@@ -58,6 +89,13 @@ def get_file_contents(
         files = get_tree_files(workspace_path, path)
     else:
         files = get_files(workspace_path, path)
+    if len(files) > 1:
+        # reads are blocking I/O; a thread pool overlaps them so the
+        # wall-clock cost approaches the slowest read instead of the sum
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            return list(executor.map(lambda file: get_file_content(workspace_path, file), files))
     return [get_file_content(workspace_path, file) for file in files]
 
 
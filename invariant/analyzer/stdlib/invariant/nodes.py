@@ -4,7 +4,7 @@ from pydantic import BaseModel, Field
 from pydantic.dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class LLM:
     vendor: str
     model: str
@@ -2,7 +2,11 @@ import re
 from dataclasses import dataclass
 from html.parser import HTMLParser
 
-from invariant.analyzer.stdlib.invariant.nodes import ToolCall
+from invariant.analyzer.stdlib.invariant.chat import _iter_message_contents
+
+# link including path etc.; compiled once at import so callers skip the
+# per-call pattern cache lookup entirely
+URL_PATTERN = re.compile(r"https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+" + r"(?:/[^ \n\"]+)*")
 
 
 @dataclass
@@ -26,13 +30,27 @@ class HiddenDataParser(HTMLParser):
             for attr in attrs:
                 if attr[0] == "href":
                     self.links.add(attr[1])
+        # URLs hidden in other attributes (img src, data-*, ...) used to be
+        # caught by the post-hoc regex pass over the raw string
+        for attr in attrs:
+            if attr[1]:
+                self._extract_links(attr[1])
 
     def handle_data(self, data):
-        pass
+        self._extract_links(data)
+
+    def handle_comment(self, data):
+        self._extract_links(data)
+
+    def _extract_links(self, text: str):
+        for match in URL_PATTERN.finditer(text):
+            self.links.add(match.group(0))
 
     def parse(self, data: str) -> HiddenHTMLData:
+        # single pass: bare-text, attribute and comment URLs are collected
+        # while the HTML is being fed, instead of re-walking the whole
+        # string with the regex afterwards
         self.feed(data)
-        self.links = self.links.union(HiddenDataParser.get_links_regex(data))
 
     @staticmethod
     def get_links_regex(data: str) -> list[str]:
@@ -42,10 +60,7 @@ class HiddenDataParser(HTMLParser):
         Returns:
             - list[str]: A list of links.
         """
-
-        # link including path etc.
-        pattern = r"https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+" + r"(?:/[^ \n\"]+)*"
-        return list(set(re.findall(pattern, data)))
+        return list({match.group(0) for match in URL_PATTERN.finditer(data)})
 
 
 def html_code(data: str | list | dict, **config: dict) -> HiddenHTMLData:
@@ -56,20 +71,8 @@ def html_code(data: str | list | dict, **config: dict) -> HiddenHTMLData:
         - HiddenHTMLData: A dataclass containing the alt texts and links.
     """
 
-    chat = (
-        data if isinstance(data, list) else ([{"content": data}] if type(data) == str else [data])
-    )
-
     res = HiddenHTMLData([], [])
-    for message in chat:
-        if message is None:
-            continue
-        if type(message) is ToolCall:
-            content = str(message)
-        else:
-            if message.content is None:
-                continue
-            content = message.content
+    for _, content in _iter_message_contents(data):
         parser = HiddenDataParser()
         parser.parse(content)
 
@@ -87,16 +90,8 @@ def links(data: str | list | dict, **config: dict) -> list[str]:
         - list[str]: A list of links.
     """
 
-    chat = (
-        data if isinstance(data, list) else ([{"content": data}] if type(data) == str else [data])
-    )
-
     res = []
-    for message in chat:
-        if message is None:
-            continue
-        if message.content is None:
-            continue
-        res.extend(HiddenDataParser.get_links_regex(message.content))
+    for _, content in _iter_message_contents(data):
+        res.extend(HiddenDataParser.get_links_regex(content))
 
     return res
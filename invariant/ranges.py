@@ -30,7 +30,7 @@ error = policy.analyze(messages).errors[1]
 # PolicyViolation(A web result contains 'France', call=...)
 error.ranges
 # [
-#   Range(object_id='4323252960', start=None, end=None, json_path='3'),
-#   Range(object_id='4299976464', start=24, end=30, json_path='3.content:24-30')
+#   Range(object_id=4323252960, start=None, end=None, json_path='3'),
+#   Range(object_id=4299976464, start=24, end=30, json_path='3.content:24-30')
 # ]
 # -> the error is caused by 3rd message (tool call), and the relevant range is in the content at offset 24-30
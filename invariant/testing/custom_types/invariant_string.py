@@ -18,6 +18,11 @@ from .invariant_bool import InvariantBool
 from .invariant_number import InvariantNumber
 from .invariant_value import InvariantValue
 
+# compiled once at module scope; _concat_addresses runs these on every
+# address of every derived value
+ADDRESS_PATTERN = re.compile(r"^(.*):(\d+)-(\d+)$")
+RANGE_PATTERN = re.compile(r"^(\d+)-(\d+)$")
+
 
 class InvariantString(InvariantValue):
     """Describes an invariant string in a test."""
@@ -162,7 +167,7 @@ class InvariantString(InvariantValue):
         addresses = []
         for old_address in self.addresses:
             # Check if old_address ends with :start-end pattern
-            match = re.match(r"^(.*):(\d+)-(\d+)$", old_address)
+            match = ADDRESS_PATTERN.match(old_address)
             assert match is not None
             prefix, start, _ = (
                 match.groups()[0],
@@ -170,7 +175,7 @@ class InvariantString(InvariantValue):
                 int(match.groups()[2]),
             )
             for new_address in other_addresses:
-                new_match = re.match(r"^(\d+)-(\d+)$", new_address)
+                new_match = RANGE_PATTERN.match(new_address)
                 assert new_match is not None
                 new_start, new_end = (
                     start + int(new_match.groups()[0]),
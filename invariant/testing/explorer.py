@@ -2,15 +2,14 @@
 """CLI to launch the Invariant Explorer as a Docker compose application."""
 
 import argparse
-import io
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
 import time
 from pathlib import Path
 
-import pexpect
 import requests
 
 parser = argparse.ArgumentParser(
@@ -157,48 +156,45 @@ class ExplorerLauncher:
 
     def ensure_has_docker_compose(self):
         """Ensure that the user has Docker Compose installed."""
-        try:
-            p = subprocess.Popen(
-                ["docker", "compose", "--version"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+        # a PATH lookup is much cheaper than spawning `docker compose --version`
+        if shutil.which("docker") is None:
+            raise Exception(
+                "Docker Compose is not installed. Please go to https://docs.docker.com/compose/install/ to install it and then re-run this command."
             )
-            p.communicate()
-
-            if p.returncode != 0:
-                raise Exception(
-                    "Docker Compose is not installed. Please go to https://docs.docker.com/compose/install/ to install it and then re-run this command."
-                )
-        except FileNotFoundError:
+        p = subprocess.run(
+            ["docker", "compose", "version"],
+            capture_output=True,
+            check=False,
+        )
+        if p.returncode != 0:
             raise Exception(
                 "Docker Compose is not installed. Please go to https://docs.docker.com/compose/install/ to install it and then re-run this command."
             )
 
     def ensure_has_docker_network(self):
         """Ensure that the user has the Docker network that the Invariant Explorer uses `invariant-explorer-web`."""
-        
+
         # check if the network exists
-        p = subprocess.Popen(
+        p = subprocess.run(
             ["docker", "network", "ls", "--format", "{{.Name}}"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            capture_output=True,
+            text=True,
+            check=False,
         )
-        out, _ = p.communicate()
         if p.returncode != 0:
             raise Exception(
                 "Failed to check for Docker networks. Please make sure Docker is installed and running."
             )
-        out = out.decode("utf-8")
-        network_names = out.split("\n")
+        # splitlines() avoids the trailing empty entry that split("\n") leaves
+        network_names = p.stdout.splitlines()
         if "invariant-explorer-web" not in network_names:
             print("[Creating network] invariant-explorer-web")
             # create the network
-            p = subprocess.Popen(
+            p = subprocess.run(
                 ["docker", "network", "create", "invariant-explorer-web"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                capture_output=True,
+                check=False,
             )
-            p.communicate()
             if p.returncode != 0:
                 raise Exception(
                     "Failed to create the Docker network `invariant-explorer-web`. Please make sure Docker is installed and running."
@@ -234,34 +230,49 @@ class ExplorerLauncher:
         }
 
     def ensure_db_ready(self):
-        """Launches and waits for the database to be ready. Then terminates the database container."""
-        # log the output
-        log = io.BytesIO()
-
+        """Launches the database container and waits for it to be ready."""
         print("[Preparing database]")
 
-        # use pexpect and wait for 'database system is ready to accept connections'
-        p = pexpect.spawn(
-            "docker compose -f "
-            + self.compose_file
-            # disable fancy docker output
-            + " -p invariant-explorer --project-directory . --no-ansi up database",
-            env={**self.env(), "DOCKER_SCAN_SUGGEST": "false"},
-            logfile=log,
-        )
-
-        try:
-            p.expect("database system is ready to accept connections", timeout=5)
+        compose_args = [
+            "docker",
+            "compose",
+            "-f",
+            self.compose_file,
+            "-p",
+            "invariant-explorer",
+            "--project-directory",
+            ".",
+        ]
 
-            p.sendcontrol("c")
-            p.expect(pexpect.EOF)
-            assert p.exitstatus is None
-            print("[Database ready]")
-        except pexpect.exceptions.ExceptionPexpect:
+        p = subprocess.run(
+            [*compose_args, "up", "-d", "database"],
+            env=self.env(),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if p.returncode != 0:
             print("Database is not ready. Please check the logs for more information.")
-            print(log.getvalue().decode("utf-8"))
+            print(p.stderr)
             exit(1)
 
+        # poll pg_isready instead of grepping streamed container logs
+        # under a pseudo-terminal
+        for _ in range(30):
+            probe = subprocess.run(
+                [*compose_args, "exec", "-T", "database", "pg_isready", "-U", "postgres"],
+                env=self.env(),
+                capture_output=True,
+                check=False,
+            )
+            if probe.returncode == 0:
+                print("[Database ready]")
+                return
+            time.sleep(0.2)
+
+        print("Database is not ready. Please check the logs for more information.")
+        exit(1)
+
     def launch(self, args: list[str]):
         """Launches the Invariant Explorer."""
         cmd = [
@@ -88,14 +88,16 @@ class OCRDetector:
         found = False
         bounding_boxes = []
 
+        # If case_sensitive is False, lowercase the needle once instead of
+        # once per detected word
+        if not case_sensitive:
+            text = text.lower()
+
         # Iterate over words in the OCR result
         for word in json_res["words"]:
             word_text = word["text"]
-
-            # If case_sensitive is False, convert both text and word to lowercase
             if not case_sensitive:
                 word_text = word_text.lower()
-                text = text.lower()
 
             # If the text is not in the word, skip
             if not (text in word_text):
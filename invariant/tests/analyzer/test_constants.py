@@ -31,6 +31,29 @@ class TestConstants(unittest.TestCase):
 
         assert len(errors) == 0, "Expected no errors, but got: " + str(errors)
 
+    def test_parameter_dependent(self):
+        policy = Policy.from_string(
+        """
+        from invariant import Message, PolicyViolation
+
+        INVALID_PATTERN := input.pattern
+
+        raise PolicyViolation("Cannot send assistant message:", msg) if:
+            (msg: Message)
+            msg.role == "assistant"
+            INVALID_PATTERN in msg.content
+        """)
+
+        input = [{"role": "assistant", "content": "Hello, X"}]
+
+        errors = policy.analyze(input, pattern="X").errors
+        assert len(errors) == 1, "Expected one error, but got: " + str(errors)
+
+        # analyzing the same policy object again with a different parameter
+        # must not reuse the constant's value from the first call
+        errors = policy.analyze(input, pattern="Z").errors
+        assert len(errors) == 0, "Expected no errors, but got: " + str(errors)
+
     def test_ref(self):
         policy = Policy.from_string(
         """